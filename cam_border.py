@@ -1,5 +1,9 @@
+import hashlib
+import io
 import math
 import os
+import numpy as np
+from collections import OrderedDict
 from PIL import Image, ImageDraw, ImageFilter
 
 import constants
@@ -8,43 +12,57 @@ import constants
 class Coordinates:
     """
     Responsible for generating the coordinate tuples along
-    the rectangle, as defined by the dimensions object.
+    the rectangle, as defined by the dimensions object. Given the ring
+    of a shape that is not rectangular, the coordinates follow the ring.
     """
 
-    def __init__(self, dimensions, degrees):
+    def __init__(self, dimensions, degrees, ring=None):
         self.dimensions = dimensions
         self.degrees = degrees
+        self.ring = ring
+        self.thetas = None
         self.coords = None
 
     @classmethod
-    def create_new(cls, dimensions, degrees):
-        coords = cls(dimensions, degrees)
+    def create_new(cls, dimensions, degrees, ring=None):
+        coords = cls(dimensions, degrees, ring)
+        coords.gen_thetas()
         coords.gen_coordinates()
         return coords
 
+    def gen_thetas(self):
+        """
+        Angles are stepped from 180 so that every angle on a coarse grid
+        also lies on any finer grid that evenly divides it.
+        """
+        thetas = []
+        step = 1
+        theta = 180 + self.degrees
+        while theta <= 360:
+            thetas.append(theta)
+            step += 1
+            theta = 180 + self.degrees * step
+        self.thetas = thetas
+
     def gen_coordinates(self):
         """
         Iterate around a circle and generate the points on a
         rectangle for the gradient start and end points.
         """
-        start = (0, self.dimensions.gradient_height / 2)
-        end = self.dimensions.invert_point(start)
-        radius = self.pythagorean(self.dimensions.gradient_center)
-        coords = []
-        theta = self.degrees + 180
-        while theta <= 360:
-            x, y = self.dimensions.gradient_center
-            dx = self.get_change_in_x(x, radius, theta)
-            dy = self.get_change_in_y(y, radius, theta)
-            # process start/end point to fix to gradient
-            start = self.adjust_to_rectangle((dx, dy), theta)
-            start = Layer.add_gradient_offset(start)
-            end = self.dimensions.invert_point(start)
-
-            coords.append((start, end))
-            theta += self.degrees
+        self.coords = [self.gen_coordinate(theta) for theta in self.thetas]
 
-        self.coords = coords
+    def gen_coordinate(self, theta):
+        if self.ring is not None and not self.ring.shape.RECTANGULAR:
+            return self.ring.gen_coordinate(theta)
+        radius = self.pythagorean(self.dimensions.gradient_center)
+        x, y = self.dimensions.gradient_center
+        dx = self.get_change_in_x(x, radius, theta)
+        dy = self.get_change_in_y(y, radius, theta)
+        # process start/end point to fix to gradient
+        start = self.adjust_to_rectangle((dx, dy), theta)
+        start = Layer.add_gradient_offset(start)
+        end = self.dimensions.invert_point(start)
+        return start, end
 
     def adjust_to_rectangle(self, point, theta):
         x, y = point
@@ -149,11 +167,267 @@ class Dimensions:
         self.layer_width = self.width - self.LAYER_OFFSET * 2
         self.layer_height = self.height - self.LAYER_OFFSET * 2
 
+    @property
+    def key(self):
+        """
+        Every input the geometry of a border depends on.
+        """
+        return (
+            self.width,
+            self.height,
+            self.INTERVAL,
+            self.LAYER_OFFSET,
+            self.GRADIENT_OFFSET,
+            self.INTERIOR_OFFSET,
+        )
+
     def invert_point(self, point):
         x, y = point
         return self.width - x, self.height - y
 
 
+class Shape:
+    """
+    Outline of the camera border, described by a signed distance field over
+    the canvas: negative inside, positive outside and zero on the outer edge
+    of the layer. The base shape is the axis-aligned layer rectangle.
+    """
+
+    NAME = constants.ShapeEnum.RECTANGLE
+    RECTANGULAR = True
+
+    @property
+    def key(self):
+        return (self.NAME,)
+
+    def gen_sdf(self, dimensions):
+        return self.box_sdf(
+            dimensions, dimensions.layer_width / 2, dimensions.layer_height / 2, 0
+        )
+
+    @staticmethod
+    def gen_grid(dimensions):
+        """
+        Pixel center offsets from the center of the canvas.
+        """
+        x = np.arange(dimensions.width) + 0.5 - dimensions.width / 2
+        y = np.arange(dimensions.height) + 0.5 - dimensions.height / 2
+        return np.meshgrid(x, y)
+
+    @classmethod
+    def box_sdf(cls, dimensions, half_width, half_height, radius):
+        radius = min(radius, half_width, half_height)
+        x, y = cls.gen_grid(dimensions)
+        qx = np.abs(x) - half_width + radius
+        qy = np.abs(y) - half_height + radius
+        outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+        inside = np.minimum(np.maximum(qx, qy), 0)
+        return outside + inside - radius
+
+
+class RoundedRectangle(Shape):
+    """
+    The layer rectangle with its outer corners rounded by radius.
+    """
+
+    NAME = constants.ShapeEnum.ROUNDED_RECTANGLE
+    RECTANGULAR = False
+    RADIUS = 40
+
+    def __init__(self, radius=None):
+        self.radius = self.RADIUS if radius is None else radius
+
+    @property
+    def key(self):
+        return (self.NAME, self.radius)
+
+    def gen_sdf(self, dimensions):
+        return self.box_sdf(
+            dimensions,
+            dimensions.layer_width / 2,
+            dimensions.layer_height / 2,
+            self.radius,
+        )
+
+
+class Circle(Shape):
+    """
+    The largest circle that fits inside the layer rectangle.
+    """
+
+    NAME = constants.ShapeEnum.CIRCLE
+    RECTANGULAR = False
+
+    def gen_sdf(self, dimensions):
+        radius = min(dimensions.layer_width, dimensions.layer_height) / 2
+        return self.box_sdf(dimensions, radius, radius, radius)
+
+
+class Mask(Shape):
+    """
+    An arbitrary outline, read from an image stretched over the layer
+    rectangle where light pixels are inside the border. Images with
+    transparency are read from their alpha instead, where opaque pixels are
+    inside.
+    """
+
+    NAME = constants.ShapeEnum.MASK
+    RECTANGULAR = False
+    THRESHOLD = 128
+
+    def __init__(self, image):
+        if "transparency" in image.info:
+            image = image.convert("RGBA")
+        if "A" in image.getbands():
+            image = image.getchannel("A")
+        self.image = image.convert("L")
+        # the key is read for every cached stage, so hash the pixels only once
+        self.digest = hashlib.sha1(self.image.tobytes()).hexdigest()
+
+    @property
+    def key(self):
+        return (self.NAME, self.image.size, self.digest)
+
+    def gen_sdf(self, dimensions):
+        offset = dimensions.LAYER_OFFSET
+        mask = self.image.resize((dimensions.layer_width, dimensions.layer_height))
+        inside = np.zeros((dimensions.height, dimensions.width), dtype=bool)
+        inside[
+            offset : offset + dimensions.layer_height,
+            offset : offset + dimensions.layer_width,
+        ] = (np.asarray(mask) >= self.THRESHOLD)
+        # only distances inside the ring and its antialiased edge are needed
+        limit = dimensions.INTERVAL + 2
+        return np.where(
+            inside,
+            0.5 - self.distance_to(~inside, limit),
+            self.distance_to(inside, limit) - 0.5,
+        )
+
+    @staticmethod
+    def distance_to(target, limit):
+        """
+        Euclidean distance from each pixel to the nearest target pixel, exact
+        up to limit and clamped there. Distances along each column come from
+        two running scans; the row pass then only has to search limit pixels
+        to either side.
+        """
+        height, width = target.shape
+        rows = np.arange(height)[:, None]
+        before = np.maximum.accumulate(
+            np.where(target, rows, -height - limit), axis=0
+        )
+        after = np.minimum.accumulate(
+            np.where(target, rows, 2 * height + limit)[::-1], axis=0
+        )[::-1]
+        column = np.minimum(np.minimum(rows - before, after - rows), limit)
+        squared = column.astype(float) ** 2
+        padded = np.pad(squared, ((0, 0), (limit, limit)), constant_values=limit**2)
+        result = squared
+        for dx in range(1, limit + 1):
+            right = padded[:, limit + dx : limit + dx + width]
+            left = padded[:, limit - dx : limit - dx + width]
+            result = np.minimum(result, np.minimum(left, right) + dx * dx)
+        return np.minimum(np.sqrt(result), limit)
+
+
+class Ring:
+    """
+    The band of a shape's signed distance field between the outer edge of the
+    layer and INTERVAL pixels inside it. Coverage is taken analytically from
+    the distance at each pixel center, which antialiases both edges of the
+    ring and reproduces hard edges wherever they fall on pixel boundaries.
+    """
+
+    def __init__(self, shape, dimensions):
+        self.shape = shape
+        self.dimensions = dimensions
+        self.sdf = None
+        self.coverage = None
+        self.band = None
+
+    @classmethod
+    def create_new(cls, shape, dimensions):
+        ring = cls(shape, dimensions)
+        ring.gen_sdf()
+        ring.gen_coverage()
+        ring.gen_band()
+        return ring
+
+    def gen_sdf(self):
+        self.sdf = self.shape.gen_sdf(self.dimensions)
+
+    def gen_coverage(self):
+        outer = np.clip(0.5 - self.sdf, 0, 1)
+        inner = np.clip(self.sdf + self.dimensions.INTERVAL + 0.5, 0, 1)
+        self.coverage = (outer * inner).ravel()
+
+    def gen_band(self):
+        self.band = np.flatnonzero(self.coverage)
+
+    def gen_coordinate(self, theta):
+        """
+        Gradient start and end points for theta. Pixels inside the ring are
+        projected onto the direction of theta through their centroid, and the
+        endpoints sit half the ring in from the two extremes, so the gradient
+        spans the ring wherever the shape puts it on the canvas.
+        """
+        inside = self.band[self.coverage[self.band] >= 0.5]
+        if not len(inside):
+            raise ValueError("shape leaves no ring inside the layer")
+        y, x = np.divmod(inside, self.dimensions.width)
+        # pixel centers
+        x = x + 0.5
+        y = y + 0.5
+        center_x, center_y = x.mean(), y.mean()
+        dx = math.cos(math.radians(theta))
+        dy = math.sin(math.radians(theta))
+        projections = (x - center_x) * dx + (y - center_y) * dy
+        low, high = projections.min(), projections.max()
+        # rings narrower than INTERVAL across keep their endpoints apart
+        inset = min(self.dimensions.INTERVAL / 2, (high - low) / 4)
+        return (
+            (center_x + (high - inset) * dx, center_y + (high - inset) * dy),
+            (center_x + (low + inset) * dx, center_y + (low + inset) * dy),
+        )
+
+    def project_gradient(self, start, end):
+        """
+        Position of every pixel in the band along the gradient from start to
+        end, projected analytically from its center and clamped to 0 at the
+        start and 1 at the end. The gradient is linear and its clamp is
+        continuous, so the center already gives the average over the pixel.
+        """
+        (x1, y1), (x2, y2) = start, end
+        length = pow(x2 - x1, 2) + pow(y2 - y1, 2)
+        rows, columns = np.divmod(self.band, self.dimensions.width)
+        positions = (
+            (columns + 0.5 - x1) * (x2 - x1) + (rows + 0.5 - y1) * (y2 - y1)
+        ) / length
+        return np.clip(positions, 0, 1)
+
+    def colorize(self, positions, primary_color, secondary_color, drawn=None):
+        """
+        Maps positions along the gradient for every pixel in the band onto
+        primary and secondary color, returning a new RGBA image. Pixels that
+        are not drawn are left transparent.
+        """
+        left = np.array(primary_color)
+        right = np.array(secondary_color)
+        colors = np.floor(left + (right - left) * positions[:, None] + 0.5)
+        alpha = np.round(self.coverage[self.band] * 255)
+        if drawn is not None:
+            colors *= drawn[:, None]
+            alpha *= drawn
+        pixels = np.zeros(
+            (self.dimensions.height * self.dimensions.width, 4), dtype=np.uint8
+        )
+        pixels[self.band, :3] = colors
+        pixels[self.band, 3] = alpha
+        pixels = pixels.reshape(self.dimensions.height, self.dimensions.width, 4)
+        return Image.fromarray(pixels, "RGBA")
+
+
 class Gradient:
     """
     Constructs a single gradient from a start and end point using primary and 
@@ -181,6 +455,20 @@ class Gradient:
         gradient.gen_color_map()
         return gradient
 
+    @classmethod
+    def create_index(cls, start, end):
+        """
+        Constructs a gradient whose colors are the 1-based step indices along
+        the interval instead of RGB values, so the geometry can be rendered
+        once and later mapped onto any pair of colors. 0 is left for pixels
+        that are never drawn.
+        """
+        gradient = cls(start, end, None, None)
+        gradient.gen_slope()
+        gradient.gen_interval()
+        gradient.gen_index_map()
+        return gradient
+
     def gen_slope(self):
         x1, y1 = self.start
         x2, y2 = self.end
@@ -213,6 +501,11 @@ class Gradient:
             self.interval, self.primary_color, self.secondary_color
         )
 
+    def gen_index_map(self):
+        self.primary_color = 1
+        self.secondary_color = self.interval + 1
+        self.color_map = range(self.primary_color, self.secondary_color + 1)
+
     @staticmethod
     def interpolate(interval, primary_color, secondary_color):
         color_delta = [
@@ -220,35 +513,53 @@ class Gradient:
             for left, right in zip(primary_color, secondary_color)
         ]
         for i in range(interval + 1):
-            yield [
+            yield tuple(
                 round(color + delta * i)
                 for color, delta in zip(primary_color, color_delta)
-            ]
+            )
 
 
 class Layer:
     """
     Represents a single frame of the camera border. It applies the 
     gradient object to a PIL image and trims it to our specified dimensions.
+
+    An "I" mode layer holds the step indices of an index gradient (see
+    Gradient.create_index) rather than colors. It is never trimmed;
+    colorize maps it to RGBA within the ring of a shape.
     """
 
-    def __init__(self, dimensions):
+    MODE_TO_BACKGROUND = {
+        "RGBA": (0, 0, 0, 0),
+        "I": 0,
+    }
+
+    def __init__(self, dimensions, mode="RGBA"):
         self.dimensions = dimensions
+        self.mode = mode
+        self.background = self.MODE_TO_BACKGROUND[mode]
         self.image = None
         self.drawing = None
 
     @classmethod
-    def create_new(cls, dimensions):
-        image = cls(dimensions)
+    def create_new(cls, dimensions, mode="RGBA"):
+        image = cls(dimensions, mode)
         image.gen_pil_image()
         image.gen_drawing()
         return image
 
+    @classmethod
+    def create_from_image(cls, dimensions, image):
+        layer = cls(dimensions, image.mode)
+        layer.image = image
+        layer.gen_drawing()
+        return layer
+
     def gen_pil_image(self):
         self.image = Image.new(
-            "RGBA",
+            self.mode,
             (self.dimensions.width, self.dimensions.height),
-            color=(0, 0, 0, 0),
+            color=self.background,
         )
 
     def save(self, filename):
@@ -374,7 +685,7 @@ class Layer:
                 ]
             self.drawing.line(
                 coordinates,
-                fill=tuple(color),
+                fill=color,
                 width=1,
             )
 
@@ -393,7 +704,7 @@ class Layer:
             )
             self.drawing.line(
                 [first_intercept, second_intercept],
-                fill=tuple(color),
+                fill=color,
                 width=math.ceil(abs(m)) + 1,
             )
 
@@ -422,6 +733,10 @@ class Layer:
         )
 
     def trim(self):
+        """
+        Cuts an RGBA layer down to the rectangular ring. Index layers are not
+        trimmed; the ring of their shape is applied in colorize instead.
+        """
         self.trim_interior()
         self.trim_edges()
 
@@ -458,6 +773,17 @@ class Layer:
             box=(self.dimensions.LAYER_OFFSET + self.dimensions.layer_width, 0),
         )
 
+    def colorize(self, gradient, ring, primary_color, secondary_color):
+        """
+        Maps an index layer onto primary and secondary color within the ring,
+        returning a new RGBA image. Only pixels in the ring band are sampled.
+        """
+        indices = np.asarray(self.image).ravel()[ring.band]
+        positions = (indices - 1) / gradient.interval
+        return ring.colorize(
+            positions, primary_color, secondary_color, drawn=indices > 0
+        )
+
     def blur(self, radius):
         self.image = self.image.filter(ImageFilter.GaussianBlur(radius))
 
@@ -516,6 +842,243 @@ class Layer:
         return x + Dimensions.LAYER_OFFSET, y + Dimensions.LAYER_OFFSET
 
 
+class Stage(OrderedDict):
+    """
+    Results of one stage of the render pipeline, keyed by the inputs they were
+    computed from. At most maxsize results are kept in memory, evicting the
+    least recently used. Given a directory, each result is also dumped to a
+    file named by a hash of its key, so later runs can load it instead, and at
+    most files of them are kept there, evicting the least recently used.
+    """
+
+    def __init__(
+        self, maxsize=None, directory=None, dump=None, load=None, files=None
+    ):
+        super().__init__()
+        self.maxsize = maxsize
+        self.directory = directory
+        self.dump = dump
+        self.load = load
+        self.files = files
+
+    def memoize(self, key, factory):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        path = self.get_path(key)
+        if path and os.path.exists(path):
+            result = self.load(path)
+            # loading counts as a use, so recently used files survive eviction
+            os.utime(path)
+        else:
+            result = factory()
+            if path:
+                os.makedirs(self.directory, exist_ok=True)
+                # dump beside the final path so a crash never leaves a partial file
+                self.dump(result, f"{path}.tmp")
+                os.replace(f"{path}.tmp", path)
+                self.evict_files()
+        self[key] = result
+        if self.maxsize is not None and len(self) > self.maxsize:
+            self.popitem(last=False)
+        return result
+
+    def get_path(self, key):
+        if self.directory is None:
+            return None
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.png")
+
+    def evict_files(self):
+        if self.files is None:
+            return
+        entries = [
+            entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")
+        ]
+        if len(entries) <= self.files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries[: len(entries) - self.files]:
+            os.remove(entry.path)
+
+
+class RenderCache:
+    """
+    Memoizes each stage of the render pipeline on the inputs it depends on,
+    so a re-run only recomputes the stages whose inputs changed:
+
+        dimensions -> coordinates -> geometry -> frames -> encoded
+
+    Coordinates and geometry are keyed per angle, so changing the degree step
+    reuses every angle that lines up with the new grid, and geometry holds
+    index layers, so changing colors reuses all of it. Rings are computed once
+    per shape and size. Antialiased frames take their geometry from positions
+    projected onto the ring instead of index layers.
+
+    Frames themselves are not memoized, since coloring geometry is cheap and
+    CameraBorder already holds the frames it renders. Given a directory,
+    geometry and encoded frames are kept on disk, at most FILES of each, so
+    separate runs reuse them, and geometry is loaded back on demand instead of
+    being held in memory. Otherwise results are kept in memory for at most
+    MAXSIZE angles or frames, and RINGS rings.
+    """
+
+    VERSION = 1
+    MAXSIZE = 60
+    RINGS = 4
+    FILES = 360
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.dimensions = Stage()
+        self.rings = Stage(maxsize=self.RINGS)
+        self.coordinates = Stage()
+        self.geometry = Stage(
+            maxsize=self.MAXSIZE if directory is None else 1,
+            directory=self.get_directory("geometry"),
+            dump=self.dump_index,
+            load=self.load_index,
+            files=self.FILES,
+        )
+        self.positions = Stage(maxsize=self.MAXSIZE)
+        self.encoded = Stage(
+            maxsize=self.MAXSIZE,
+            directory=self.get_directory("encoded"),
+            dump=self.dump_bytes,
+            load=self.load_bytes,
+            files=self.FILES,
+        )
+
+    def get_directory(self, stage):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"v{self.VERSION}", stage)
+
+    @staticmethod
+    def dump_index(image, path):
+        # indices stay well below 2 ** 16, so 16 bit PNGs hold them exactly, and
+        # a light compression keeps dumping far cheaper than drawing
+        image.convert("I;16").save(path, format="PNG", compress_level=1)
+
+    @staticmethod
+    def load_index(path):
+        with Image.open(path) as image:
+            return image.convert("I")
+
+    @staticmethod
+    def dump_bytes(data, path):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def load_bytes(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def get_angle_key(coordinates, theta):
+        """
+        Gradient endpoints, and so geometry, follow the ring of their shape.
+        """
+        return (coordinates.dimensions.key, coordinates.ring.shape.key, theta)
+
+    def get_dimensions(self, width, height):
+        return self.dimensions.memoize(
+            (width, height),
+            lambda: Dimensions.create_new(width, height),
+        )
+
+    def get_ring(self, shape, dimensions):
+        return self.rings.memoize(
+            (shape.key, dimensions.key),
+            lambda: Ring.create_new(shape, dimensions),
+        )
+
+    def get_coordinate(self, coordinates, theta):
+        return self.coordinates.memoize(
+            self.get_angle_key(coordinates, theta),
+            lambda: coordinates.gen_coordinate(theta),
+        )
+
+    def get_geometry(self, coordinates, theta):
+        """
+        Returns the index layer and its gradient for a single angle. The layer
+        is left untrimmed; the ring of each shape is applied in colorize.
+        """
+        dimensions = coordinates.dimensions
+        start, end = self.get_coordinate(coordinates, theta)
+        gradient = Gradient.create_index(start, end)
+
+        def render():
+            layer = Layer.create_new(dimensions, mode="I")
+            layer.apply_gradient(gradient)
+            return layer.image
+
+        image = self.geometry.memoize(self.get_angle_key(coordinates, theta), render)
+        return Layer.create_from_image(dimensions, image), gradient
+
+    def get_positions(self, coordinates, ring, theta):
+        """
+        Returns the gradient positions of the ring band for a single angle.
+        """
+
+        def project():
+            start, end = self.get_coordinate(coordinates, theta)
+            return ring.project_gradient(start, end)
+
+        return self.positions.memoize(self.get_angle_key(coordinates, theta), project)
+
+    def get_frame(
+        self, coordinates, ring, theta, primary_color, secondary_color, antialias=False
+    ):
+        """
+        Returns the frame key and the RGBA image for a single angle and
+        color direction within the ring. Antialiased frames are colored from
+        positions projected onto the ring instead of an index layer.
+        """
+        # index layers are drawn with rectangle-only geometry, so other
+        # shapes always take their positions from the ring
+        antialias = antialias or not ring.shape.RECTANGULAR
+        key = (
+            coordinates.dimensions.key,
+            ring.shape.key,
+            theta,
+            primary_color,
+            secondary_color,
+            antialias,
+        )
+
+        def render():
+            if antialias:
+                positions = self.get_positions(coordinates, ring, theta)
+                return ring.colorize(positions, primary_color, secondary_color)
+            layer, gradient = self.get_geometry(coordinates, theta)
+            return layer.colorize(gradient, ring, primary_color, secondary_color)
+
+        return key, render()
+
+    def get_encoded(self, key, image):
+        def encode():
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        return self.encoded.memoize(key, encode)
+
+    def write(self, filename, key, image):
+        """
+        Writes the encoded frame to filename, skipping the write entirely when
+        the file already holds exactly these bytes.
+        """
+        data = self.get_encoded(key, image)
+        if os.path.exists(filename):
+            with open(filename, "rb") as f:
+                if f.read() == data:
+                    return
+        with open(filename, "wb") as f:
+            f.write(data)
+
+
 class CameraBorder:
     """
     Brings all the other classes together to construct a sequence of images that 
@@ -523,13 +1086,29 @@ class CameraBorder:
     """
 
     DEGREES = 6
-
-    def __init__(self, dimensions, primary_color, secondary_color):
+    CACHE_DIR = ".cache"
+
+    def __init__(
+        self,
+        dimensions,
+        primary_color,
+        secondary_color,
+        degrees=None,
+        shape=None,
+        antialias=False,
+        cache=None,
+    ):
         self.dimensions = dimensions
         self.primary_color = primary_color
         self.secondary_color = secondary_color
+        self.degrees = degrees or self.DEGREES
+        self.shape = shape or Shape()
+        self.antialias = antialias
+        self.cache = cache or RenderCache()
 
+        self.ring = None
         self.coordinates = None
+        self.keys = None
         self.layers = None
 
     @classmethod
@@ -539,56 +1118,77 @@ class CameraBorder:
         primary_color=None,
         secondary_color=None,
         output_dir=None,
+        degrees=None,
+        shape=None,
+        antialias=False,
+        cache=None,
     ):
+        cache = cache or RenderCache(os.path.join(output_dir, cls.CACHE_DIR))
         width, height = constants.ASPECT_RATIO_TO_DIMENSIONS[aspect_ratio]
-        dimensions = Dimensions.create_new(width, height)
+        dimensions = cache.get_dimensions(width, height)
         primary_color = cls.enforce_rgb(primary_color)
         secondary_color = cls.enforce_rgb(secondary_color)
-        camera_border = cls(dimensions, primary_color, secondary_color)
+        camera_border = cls(
+            dimensions,
+            primary_color,
+            secondary_color,
+            degrees=degrees,
+            shape=shape,
+            antialias=antialias,
+            cache=cache,
+        )
+        camera_border.gen_ring()
         camera_border.gen_coordinates()
         camera_border.gen_layers()
         camera_border.save(output_dir)
+        return camera_border
+
+    def gen_ring(self):
+        self.ring = self.cache.get_ring(self.shape, self.dimensions)
 
     def gen_coordinates(self):
-        self.coordinates = Coordinates.create_new(
+        self.coordinates = Coordinates(
             dimensions=self.dimensions,
-            degrees=self.DEGREES,
+            degrees=self.degrees,
+            ring=self.ring,
         )
+        self.coordinates.gen_thetas()
 
     def gen_layers(self):
         primary_to_secondary = []
         secondary_to_primary = []
-        for coord in self.coordinates.coords:
-            start, end = coord
-            # create first layer
-            first_layer = Layer.create_new(self.dimensions)
-            first_gradient = Gradient.create_new(
-                start, end, self.primary_color, self.secondary_color
+        for theta in self.coordinates.thetas:
+            primary_to_secondary.append(
+                self.cache.get_frame(
+                    self.coordinates,
+                    self.ring,
+                    theta,
+                    self.primary_color,
+                    self.secondary_color,
+                    antialias=self.antialias,
+                )
             )
-            # apply, trim, append first layer
-            first_layer.apply_gradient(first_gradient)
-            first_layer.trim()
-            primary_to_secondary.append(first_layer.image)
-            # create second layer
-            second_layer = Layer.create_new(self.dimensions)
-            second_gradient = Gradient.create_new(
-                start, end, self.secondary_color, self.primary_color
+            secondary_to_primary.append(
+                self.cache.get_frame(
+                    self.coordinates,
+                    self.ring,
+                    theta,
+                    self.secondary_color,
+                    self.primary_color,
+                    antialias=self.antialias,
+                )
             )
-            # apply, trim, append second layer
-            second_layer.apply_gradient(second_gradient)
-            second_layer.trim()
-            secondary_to_primary.append(second_layer.image)
-        self.layers = []
-        self.layers.extend(primary_to_secondary)
-        self.layers.extend(secondary_to_primary)
+        frames = primary_to_secondary + secondary_to_primary
+        self.keys = [key for key, _ in frames]
+        self.layers = [image for _, image in frames]
 
     def save(self, output_dir):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
-        for i, layer in enumerate(self.layers):
+        for i, (key, layer) in enumerate(zip(self.keys, self.layers)):
             if i < 10:
                 i = f"0{i}"
-            layer.save(f"{output_dir}/{i}.png")
+            self.cache.write(f"{output_dir}/{i}.png", key, layer)
 
     @staticmethod
     def enforce_rgb(color):
@@ -614,3 +1214,16 @@ class CameraBorder:
     @staticmethod
     def process_aspect_ratio(aspect_ratio):
         return constants.ASPECT_STR_TO_ENUM[aspect_ratio]
+
+    @staticmethod
+    def process_shape(shape, corner_radius=None, mask=None):
+        shape = constants.SHAPE_STR_TO_ENUM[shape]
+        if shape == constants.ShapeEnum.ROUNDED_RECTANGLE:
+            return RoundedRectangle(corner_radius)
+        if shape == constants.ShapeEnum.CIRCLE:
+            return Circle()
+        if shape == constants.ShapeEnum.MASK:
+            if mask is None:
+                raise ValueError("the mask shape requires a mask image")
+            return Mask(Image.open(mask))
+        return Shape()
@@ -19,6 +19,13 @@ class QuadrantEnum(Enum):
     FOURTH = 4
 
 
+class ShapeEnum(Enum):
+    RECTANGLE = 1
+    ROUNDED_RECTANGLE = 2
+    CIRCLE = 3
+    MASK = 4
+
+
 class SlopeEnum(Enum):
     DEFAULT = 1
     HORIZONTAL = 2
@@ -62,6 +69,13 @@ ASPECT_STR_TO_ENUM = {
     "1:1": AspectRatioEnum.ONE_BY_ONE,
 }
 
+SHAPE_STR_TO_ENUM = {
+    "rectangle": ShapeEnum.RECTANGLE,
+    "rounded": ShapeEnum.ROUNDED_RECTANGLE,
+    "circle": ShapeEnum.CIRCLE,
+    "mask": ShapeEnum.MASK,
+}
+
 ASPECT_RATIO_TO_DIMENSIONS = {
     AspectRatioEnum.ONE_BY_ONE: (1120, 1120), 
     AspectRatioEnum.FOUR_BY_THREE: (1120, 840), 
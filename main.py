@@ -22,7 +22,31 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--primary_color", type=str, default=None)
     parser.add_argument("--secondary_color", type=str, default=None)
     parser.add_argument("--profile", type=str, default="cm")
-    return parser.parse_args()
+    parser.add_argument(
+        "--shape",
+        type=str,
+        default="rectangle",
+        choices=list(constants.SHAPE_STR_TO_ENUM),
+    )
+    parser.add_argument("--corner_radius", type=int, default=None)
+    parser.add_argument(
+        "--mask",
+        type=str,
+        default=None,
+        help=(
+            "image whose light pixels, or opaque pixels if it has transparency, "
+            "are inside the border"
+        ),
+    )
+    parser.add_argument("--antialias", action="store_true")
+    args = parser.parse_args()
+    if args.shape == "mask" and args.mask is None:
+        parser.error("--shape mask requires --mask")
+    if args.mask is not None and not os.path.isfile(args.mask):
+        parser.error(f"--mask {args.mask} is not a file")
+    if args.corner_radius is not None and args.corner_radius < 0:
+        parser.error("--corner_radius must not be negative")
+    return args
 
 
 if __name__ == "__main__":
@@ -33,9 +57,14 @@ if __name__ == "__main__":
         profile=args.profile,
     )
     aspect_ratio = CameraBorder.process_aspect_ratio(args.aspect_ratio)
+    shape = CameraBorder.process_shape(
+        args.shape, corner_radius=args.corner_radius, mask=args.mask
+    )
     camera_border = CameraBorder.create_new(
         aspect_ratio=aspect_ratio,
         primary_color=primary_color,
         secondary_color=secondary_color,
         output_dir=args.output_dir,
+        shape=shape,
+        antialias=args.antialias,
     )
\ No newline at end of file
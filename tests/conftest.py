@@ -0,0 +1,101 @@
+import time
+import tracemalloc
+
+import pytest
+
+
+ERRORS_KEY = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        help="Rewrite the golden frames from the Layer based renderer.",
+    )
+    parser.addoption(
+        "--time-budgets",
+        action="store_true",
+        help="Also assert the time budgets, which depend on the machine.",
+    )
+
+
+def pytest_configure(config):
+    config.stash[ERRORS_KEY] = []
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    errors = config.stash[ERRORS_KEY]
+    if not errors:
+        return
+    terminalreporter.section("frame error")
+    for name, max_error, mean_error in errors:
+        terminalreporter.write_line(
+            f"{name:<40} max {max_error:>3} mean {mean_error:.4f}"
+        )
+
+
+class Budget:
+    """
+    Measures the wall time and traced peak memory of a block and asserts
+    they stay within budget. Peak memory is taken from tracemalloc, which
+    follows Python and numpy allocations but not PIL's internal buffers. Wall
+    time is only asserted when seconds is given.
+    """
+
+    def __init__(self, seconds, megabytes):
+        self.seconds = seconds
+        self.megabytes = megabytes
+        self.elapsed = None
+        self.peak = None
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.peak = peak / pow(2, 20)
+        if exc_info[0] is not None:
+            return
+        if self.seconds is not None:
+            assert self.elapsed <= self.seconds, (
+                f"took {self.elapsed:.2f}s, budget is {self.seconds}s"
+            )
+        assert self.peak <= self.megabytes, (
+            f"peaked at {self.peak:.0f}MB, budget is {self.megabytes}MB"
+        )
+
+
+@pytest.fixture
+def budget(request, record_property):
+    """
+    Returns a factory for Budget context managers, which only assert time
+    with --time-budgets. The measurements of each are recorded as test
+    properties.
+    """
+    budgets = []
+    timed = request.config.getoption("--time-budgets")
+
+    def create_new(seconds, megabytes):
+        budgets.append(Budget(seconds if timed else None, megabytes))
+        return budgets[-1]
+
+    yield create_new
+    for i, measured in enumerate(budgets):
+        record_property(f"seconds_{i}", measured.elapsed)
+        record_property(f"megabytes_{i}", measured.peak)
+
+
+@pytest.fixture
+def frame_errors(request):
+    """
+    Records max and mean per-pixel error for the terminal summary.
+    """
+    errors = request.config.stash[ERRORS_KEY]
+    return lambda max_error, mean_error: errors.append(
+        (request.node.name, max_error, mean_error)
+    )
@@ -0,0 +1,345 @@
+import os
+import pathlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import constants
+from cam_border import (
+    CameraBorder,
+    Circle,
+    Dimensions,
+    Gradient,
+    Layer,
+    Mask,
+    RenderCache,
+    Ring,
+    RoundedRectangle,
+    Shape,
+    Stage,
+)
+
+
+GOLDEN_DIR = pathlib.Path(__file__).parent / "golden"
+# Every frame comes from the same per-angle code, with colors applied by one
+# linear map afterwards, so a sample that reaches each drawing branch stands
+# in for all 60: a shallow angle, diagonals starting in the first and second
+# quadrant, the steep angles either side of vertical where lines are widest,
+# the vertical and horizontal special cases, and both diagonals again in the
+# secondary to primary direction.
+GOLDEN_FRAMES = (0, 4, 13, 14, 15, 22, 29, 34, 52)
+CONFIGS = [
+    (profile, aspect)
+    for profile in constants.PROFILE_TO_PALETTE
+    for aspect in constants.ASPECT_STR_TO_ENUM
+]
+# seconds and traced megabytes for a full render, encode and save, about 1.5
+# times what each measured (4.2s 195MB, 4.3s 234MB, 6.9s 312MB). Times are
+# only asserted with --time-budgets, since they depend on the machine. The
+# megabytes come from tracemalloc, which sees numpy arrays but not the pixel
+# buffers PIL allocates, so they bound only part of the real peak memory.
+BUDGETS = {
+    "16:9": (6.5, 290),
+    "4:3": (6.5, 350),
+    "1:1": (10.5, 470),
+}
+TOLERANCE = 1
+ANTIALIAS_TOLERANCE = 3
+ANTIALIAS_MEAN_TOLERANCE = 0.1
+
+
+def golden_path(profile, aspect, index):
+    return GOLDEN_DIR / f"{profile}_{aspect.replace(':', 'x')}" / f"{index:02d}.png"
+
+
+def render(profile, aspect, **kwargs):
+    """
+    Builds the frames of a camera border with its own cache, without saving.
+    """
+    aspect_ratio = constants.ASPECT_STR_TO_ENUM[aspect]
+    width, height = constants.ASPECT_RATIO_TO_DIMENSIONS[aspect_ratio]
+    primary_color, secondary_color = constants.PROFILE_TO_PALETTE[profile]
+    kwargs.setdefault("cache", RenderCache())
+    border = CameraBorder(
+        Dimensions.create_new(width, height), primary_color, secondary_color, **kwargs
+    )
+    border.gen_ring()
+    border.gen_coordinates()
+    border.gen_layers()
+    return border
+
+
+def render_layer(border, index):
+    """
+    Renders a single frame the way CameraBorder did before the render cache,
+    drawing one RGBA Layer per gradient and trimming it.
+    """
+    thetas = border.coordinates.thetas
+    start, end = border.coordinates.gen_coordinate(thetas[index % len(thetas)])
+    colors = (border.primary_color, border.secondary_color)
+    if index >= len(thetas):
+        colors = colors[::-1]
+    layer = Layer.create_new(border.dimensions)
+    layer.apply_gradient(Gradient.create_new(start, end, *colors))
+    layer.trim()
+    return layer.image
+
+
+def frame_error(image, expected):
+    return np.abs(
+        np.asarray(image, dtype=int) - np.asarray(expected.convert("RGBA"), dtype=int)
+    )
+
+
+@pytest.mark.parametrize("profile, aspect", CONFIGS)
+def test_golden(profile, aspect, tmp_path, budget, frame_errors, request):
+    with budget(*BUDGETS[aspect]):
+        border = CameraBorder.create_new(
+            aspect_ratio=constants.ASPECT_STR_TO_ENUM[aspect],
+            primary_color=constants.PROFILE_TO_PALETTE[profile][0],
+            secondary_color=constants.PROFILE_TO_PALETTE[profile][1],
+            output_dir=tmp_path,
+            cache=RenderCache(),
+        )
+    assert len(list(tmp_path.glob("*.png"))) == len(border.layers)
+
+    errors = []
+    for index in GOLDEN_FRAMES:
+        path = golden_path(profile, aspect, index)
+        if request.config.getoption("--update-golden"):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            render_layer(border, index).save(path)
+        errors.append(frame_error(border.layers[index], Image.open(path)))
+    errors = np.stack(errors)
+    frame_errors(errors.max(), errors.mean())
+    assert errors.max() <= TOLERANCE
+
+
+@pytest.mark.parametrize("profile, aspect", CONFIGS)
+def test_antialias(profile, aspect, frame_errors):
+    border = render(profile, aspect, antialias=True)
+    errors = []
+    for index in GOLDEN_FRAMES:
+        expected = render_layer(border, index)
+        error = frame_error(border.layers[index], expected)
+        # the Layer renderer leaves occasional holes between its lines
+        drawn = np.asarray(expected)[..., 3] > 0
+        assert error[drawn].max() <= ANTIALIAS_TOLERANCE
+        errors.append(error)
+    errors = np.stack(errors)
+    frame_errors(errors.max(), errors.mean())
+    assert errors.mean() <= ANTIALIAS_MEAN_TOLERANCE
+
+
+def test_cache_reuse():
+    cache = RenderCache()
+    render("cm", "16:9", cache=cache)
+    geometry = dict(cache.geometry)
+
+    # a color change reuses all geometry
+    render("cy", "16:9", cache=cache)
+    assert cache.geometry == geometry
+
+    # halving the degree step reuses every angle on the old grid
+    finer = render("cy", "16:9", degrees=3, cache=cache)
+    assert len(cache.geometry) == len(finer.coordinates.thetas)
+    for key, value in geometry.items():
+        assert cache.geometry[key] is value
+
+    cold = render("cy", "16:9", degrees=3)
+    assert cold.keys == finer.keys
+    for warm_layer, cold_layer in zip(finer.layers, cold.layers):
+        assert warm_layer.tobytes() == cold_layer.tobytes()
+
+
+def test_save_skips_unchanged_frames(tmp_path):
+    border = render("cm", "16:9")
+    border.save(tmp_path)
+    modified = {path: os.stat(path).st_mtime_ns for path in tmp_path.iterdir()}
+    encoded = len(border.cache.encoded)
+
+    border.save(tmp_path)
+    assert len(border.cache.encoded) == encoded
+    for path, mtime in modified.items():
+        assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_disk_cache_reuse(tmp_path, monkeypatch):
+    def create_new(**kwargs):
+        return CameraBorder.create_new(
+            aspect_ratio=constants.AspectRatioEnum.SIXTEEN_BY_NINE,
+            primary_color=constants.Colors.CYAN,
+            secondary_color=constants.Colors.MAGENTA,
+            output_dir=tmp_path,
+            **kwargs,
+        )
+
+    first = create_new()
+    assert (tmp_path / CameraBorder.CACHE_DIR).is_dir()
+
+    # a separate run neither draws geometry nor encodes frames again
+    def fail(*args, **kwargs):
+        raise AssertionError("recomputed a cached stage")
+
+    monkeypatch.setattr(Layer, "apply_gradient", fail)
+    monkeypatch.setattr(Image.Image, "save", fail)
+    second = create_new()
+    for first_layer, second_layer in zip(first.layers, second.layers):
+        assert first_layer.tobytes() == second_layer.tobytes()
+
+    # halving the degree step only draws the new angles
+    monkeypatch.undo()
+    original = Layer.apply_gradient
+    drawn = []
+
+    def apply_gradient(layer, gradient):
+        drawn.append(gradient)
+        original(layer, gradient)
+
+    monkeypatch.setattr(Layer, "apply_gradient", apply_gradient)
+    finer = create_new(degrees=3)
+    assert len(drawn) == len(finer.coordinates.thetas) - len(first.coordinates.thetas)
+
+
+def test_stage_evicts_files(tmp_path):
+    def create_new():
+        return Stage(
+            directory=str(tmp_path),
+            dump=RenderCache.dump_bytes,
+            load=RenderCache.load_bytes,
+            files=2,
+        )
+
+    stage = create_new()
+    for key in range(2):
+        stage.memoize(key, lambda: b"frame")
+        os.utime(stage.get_path(key), ns=(key, key))
+    # loading key 0 makes key 1 the least recently used
+    create_new().memoize(0, lambda: b"frame")
+    stage.memoize(2, lambda: b"frame")
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(stage.get_path(key)) for key in (0, 2)
+    )
+
+
+def test_disk_cache_follows_dimensions(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path))
+    render("cm", "16:9", cache=cache)
+
+    # the square variant of the border misses everything cached for the default
+    for name, value in [
+        ("INTERVAL", 70),
+        ("LAYER_OFFSET", 70),
+        ("GRADIENT_OFFSET", 105),
+        ("INTERIOR_OFFSET", 140),
+    ]:
+        monkeypatch.setattr(Dimensions, name, value)
+    square = render("cm", "16:9", cache=RenderCache(str(tmp_path)))
+    cold = render("cm", "16:9")
+    for warm_layer, cold_layer in zip(square.layers, cold.layers):
+        assert warm_layer.tobytes() == cold_layer.tobytes()
+
+
+def test_mask_matches_rectangle():
+    dimensions = Dimensions.create_new(400, 300)
+    rectangle = Ring.create_new(Shape(), dimensions)
+    mask = Ring.create_new(Mask(Image.new("L", (10, 10), 255)), dimensions)
+    assert np.array_equal(mask.coverage, rectangle.coverage)
+
+
+def test_mask_reads_alpha():
+    image = Image.new("RGBA", (10, 10), (255, 255, 255, 0))
+    image.paste((255, 255, 255, 255), (0, 0, 5, 10))
+    expected = Image.new("L", (10, 10))
+    expected.paste(255, (0, 0, 5, 10))
+    assert Mask(image).image.tobytes() == expected.tobytes()
+
+
+def test_mask_key_includes_size():
+    wide = Mask(Image.new("L", (20, 10), 255))
+    tall = Mask(Image.new("L", (10, 20), 255))
+    assert wide.key != tall.key
+
+
+@pytest.mark.parametrize("density", [0, 0.002, 0.02, 0.5])
+def test_mask_distance_to(density):
+    limit = 6
+    target = np.random.default_rng(0).random((40, 50)) < density
+    rows, columns = np.nonzero(target)
+    y, x = np.indices(target.shape)
+    brute_force = np.full(target.shape, float(limit))
+    for row, column in zip(rows, columns):
+        brute_force = np.minimum(brute_force, np.hypot(y - row, x - column))
+    np.testing.assert_allclose(Mask.distance_to(target, limit), brute_force)
+
+
+def test_rounded_rectangle_sdf():
+    dimensions = Dimensions.create_new(400, 300)
+    rectangle = Shape().gen_sdf(dimensions)
+    np.testing.assert_allclose(RoundedRectangle(0).gen_sdf(dimensions), rectangle)
+
+    radius = 30
+    rounded = RoundedRectangle(radius).gen_sdf(dimensions)
+    offset = dimensions.LAYER_OFFSET
+    # the corner pixel is cut off by a quarter circle around (100, 100)
+    corner = np.hypot(radius - 0.5, radius - 0.5) - radius
+    assert rounded[offset, offset] == pytest.approx(corner)
+    # while the middle of each edge is untouched
+    np.testing.assert_allclose(rounded[offset, 150:250], rectangle[offset, 150:250])
+
+
+def test_circle_sdf():
+    dimensions = Dimensions.create_new(400, 300)
+    x, y = Shape.gen_grid(dimensions)
+    radius = min(dimensions.layer_width, dimensions.layer_height) / 2
+    np.testing.assert_allclose(
+        Circle().gen_sdf(dimensions), np.hypot(x, y) - radius, atol=1e-9
+    )
+
+
+@pytest.mark.parametrize(
+    "shape", [Circle(), RoundedRectangle(120)], ids=lambda shape: shape.NAME.name
+)
+def test_shape_spans_gradient(shape):
+    border = render("cm", "16:9", shape=shape)
+    dimensions = border.dimensions
+    primary_color, secondary_color = constants.PROFILE_TO_PALETTE["cm"]
+    if isinstance(shape, Circle):
+        # endpoints sit in the middle of the ring, to within a pixel
+        middle = (
+            min(dimensions.layer_width, dimensions.layer_height) / 2
+            - dimensions.INTERVAL / 2
+        )
+        for start, end in map(border.coordinates.gen_coordinate, [186, 270, 318]):
+            for x, y in (start, end):
+                center_x, center_y = dimensions.width / 2, dimensions.height / 2
+                distance = np.hypot(x - center_x, y - center_y)
+                assert distance == pytest.approx(middle, abs=1)
+    for layer in border.layers:
+        pixels = np.asarray(layer).reshape(-1, 4)
+        colors = set(map(tuple, pixels[pixels[:, 3] == 255, :3]))
+        assert primary_color in colors
+        assert secondary_color in colors
+        # curved edges are antialiased
+        assert ((pixels[:, 3] > 0) & (pixels[:, 3] < 255)).any()
+
+
+def test_off_center_mask_spans_gradient():
+    image = Image.new("L", (100, 100))
+    # a square in the top left corner, far from the center of the canvas
+    image.paste(255, (5, 5, 45, 45))
+    border = render("cm", "16:9", shape=Mask(image))
+    primary_color, secondary_color = constants.PROFILE_TO_PALETTE["cm"]
+    for layer in border.layers:
+        pixels = np.asarray(layer).reshape(-1, 4)
+        colors = set(map(tuple, pixels[pixels[:, 3] == 255, :3]))
+        assert primary_color in colors
+        assert secondary_color in colors
+
+
+def test_empty_mask_has_no_coordinates():
+    dimensions = Dimensions.create_new(400, 300)
+    ring = Ring.create_new(Mask(Image.new("L", (10, 10))), dimensions)
+    with pytest.raises(ValueError):
+        ring.gen_coordinate(270)